@@ -21,15 +21,59 @@ Paths:
   root            the root node itself
 """
 
-import copy as _copy
-import difflib
-import fnmatch
+# copy, difflib and fnmatch are imported lazily inside the few functions
+# that need them — they are off the hot path and cost startup time in
+# scripting loops.
 import json
+import mmap
+import os
 import re
 import sys
+from itertools import islice
 from pathlib import Path
 from typing import Any, Optional
 
+# Optional C accelerator — several times faster than stdlib json for both
+# parsing and serializing. All I/O helpers degrade to json when absent.
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+
+# orjson coerces integers beyond 64 bits to lossy floats (newer releases
+# raise instead of coercing). A digit-run pre-scan routes any input that
+# could hold one to stdlib json, which parses exactly; 19 digits is the
+# first width that can overflow, and false positives (long digit runs
+# inside strings) only cost the fast path.
+_LONG_DIGITS = re.compile(rb"\d{19}")
+_LONG_DIGITS_S = re.compile(r"\d{19}")
+
+
+def _loads(raw) -> Any:
+    if _orjson is not None:
+        scan = _LONG_DIGITS_S if isinstance(raw, str) else _LONG_DIGITS
+        if scan.search(raw) is None:
+            return _orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _print_compact(data: Any) -> None:
+    """Compact JSON to stdout. With orjson the payload is serialized
+    straight to bytes and written in one call, skipping the str build
+    and the re-encode inside print()."""
+    if _orjson is not None:
+        try:
+            buf = _orjson.dumps(data)
+        except TypeError:
+            pass   # e.g. integers beyond 64 bits — use stdlib below
+        else:
+            sys.stdout.flush()   # keep ordering with prior text prints
+            sys.stdout.buffer.write(buf + b"\n")
+            sys.stdout.buffer.flush()
+            return
+    print(json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+
 
 # ── ANSI ───────────────────────────────────────────────────────────────────────
 C_PATH  = "\033[36m"    # cyan      path
@@ -220,11 +264,18 @@ def consume_token_budget(line: str) -> None:
     _TOKEN_USED += _estimate_tokens(line)
 
 
+# Pre-colored type labels — identical per type, so build them once
+# instead of re-interpolating ANSI codes for every row of a large view.
+_TYPE_COLORED = {n: f"{C_TYPE}{n}{C_RESET}" for n in
+                 ("null", "boolean", "integer", "number", "string",
+                  "object", "array", "unknown")}
+
+
 def format_row(path: str, type_name: str, value) -> str:
     """Same formatting as print_row, but returns the colored string instead
     of printing — needed for token-budget pre-check in cmd_view / cmd_find."""
     p = f"{C_PATH}{path}{C_RESET}"
-    t = f"{C_TYPE}{type_name}{C_RESET}"
+    t = _TYPE_COLORED.get(type_name) or f"{C_TYPE}{type_name}{C_RESET}"
     if value is None:
         return f"{p} {t}"
     if value == "(empty)":
@@ -288,15 +339,21 @@ def maybe_mask(path: str, value: Any) -> Any:
 
 
 # ── Type helpers ───────────────────────────────────────────────────────────────
+# type(True) is bool (not int), so a single identity lookup is exact —
+# no isinstance chain, no bool-before-int ordering hack.
+_TYPE_MAP = {
+    type(None): "null",
+    bool:       "boolean",
+    int:        "integer",
+    float:      "number",
+    str:        "string",
+    dict:       "object",
+    list:       "array",
+}
+
+
 def get_type_name(data: Any) -> str:
-    if data is None:           return "null"
-    if isinstance(data, bool): return "boolean"   # before int
-    if isinstance(data, int):  return "integer"
-    if isinstance(data, float):return "number"
-    if isinstance(data, str):  return "string"
-    if isinstance(data, dict): return "object"
-    if isinstance(data, list): return "array"
-    return "unknown"
+    return _TYPE_MAP.get(type(data), "unknown")
 
 
 def fmt_val(data: Any) -> str:
@@ -307,77 +364,116 @@ def fmt_val(data: Any) -> str:
 
 
 # ── Flatten ────────────────────────────────────────────────────────────────────
-def flatten(data: Any, path: str = "root", root_level: bool = True,
+def _render_path(segs: tuple) -> str:
+    """Materialize a segment tuple as a display path string.
+    () → 'root'; ('users', 0, 'name') → 'users[0].name'; '[*]' segments
+    (schema rows) render literally."""
+    if not segs:
+        return "root"
+    parts: list = []
+    for s in segs:
+        if isinstance(s, int):
+            parts.append(f"[{s}]")
+        elif s == "[*]":
+            parts.append("[*]")
+        elif parts:
+            parts.append("." + s)
+        else:
+            parts.append(s)
+    first = segs[0]
+    if isinstance(first, int) or first == "[*]":
+        return "root" + "".join(parts)
+    return "".join(parts)
+
+
+def flatten(data: Any, segs: tuple = (),
             max_depth: Optional[int] = None, _depth: int = 0) -> list:
     """
-    Returns list of (path, type_name, value_marker):
+    Returns list of (segments, type_name, value_marker):
+      segments     = tuple of str keys / int indices; () is the root
       value_marker = None        → container with children
       value_marker = "(empty)"   → empty container
       value_marker = "{N keys}"  → object collapsed by --depth
       value_marker = "[N items]" → array collapsed by --depth
       value_marker = <Any>       → primitive value (None means JSON null)
 
+    Paths are kept as segment tuples internally — building a display
+    string at every descent costs O(depth²) string bytes per leaf; the
+    string form is produced once at print/filter time via _render_path.
+
     max_depth: if set, containers at this depth are shown as summaries.
     Array indices do NOT count toward depth; only object key access does.
     """
-    rows = []
-    if isinstance(data, dict):
-        if max_depth is not None and _depth >= max_depth and not root_level:
-            n = len(data)
-            summary = f"{{{n} key{'s' if n != 1 else ''}}}"
-            rows.append((path, "object", summary))
-        else:
-            rows.append((path, "object", None if data else "(empty)"))
-            for k, v in data.items():
-                child = k if root_level else f"{path}.{k}"
-                rows.extend(flatten(v, child, False, max_depth, _depth + 1))
-    elif isinstance(data, list):
-        if max_depth is not None and _depth >= max_depth and not root_level:
-            n = len(data)
-            summary = f"[{n} item{'s' if n != 1 else ''}]"
-            rows.append((path, "array", summary))
+    rows: list = []
+    # Iterative DFS: children are pushed in reverse so pop() order matches
+    # the recursive output order. Avoids O(depth) Python call frames and
+    # per-call list allocations on deep documents.
+    stack = [(data, segs, _depth)]
+    while stack:
+        node, p, depth = stack.pop()
+        if isinstance(node, dict):
+            if max_depth is not None and depth >= max_depth and p:
+                n = len(node)
+                rows.append((p, "object", f"{{{n} key{'s' if n != 1 else ''}}}"))
+            else:
+                rows.append((p, "object", None if node else "(empty)"))
+                for k, v in reversed(node.items()):
+                    stack.append((v, p + (k,), depth + 1))
+        elif isinstance(node, list):
+            if max_depth is not None and depth >= max_depth and p:
+                n = len(node)
+                rows.append((p, "array", f"[{n} item{'s' if n != 1 else ''}]"))
+            else:
+                rows.append((p, "array", None if node else "(empty)"))
+                for i in range(len(node) - 1, -1, -1):
+                    # array indices do not increment depth
+                    stack.append((node[i], p + (i,), depth))
         else:
-            rows.append((path, "array", None if data else "(empty)"))
-            for i, v in enumerate(data):
-                # array indices do not increment depth
-                rows.extend(flatten(v, f"{path}[{i}]", False, max_depth, _depth))
-    else:
-        rows.append((path, get_type_name(data), data))
+            rows.append((p, get_type_name(node), node))
     return rows
 
 
 # ── Null inference ─────────────────────────────────────────────────────────────
-_IDX = re.compile(r'\[\d+\]')
+def sig(segs: tuple) -> tuple:
+    """Structural signature: array indices collapse to '[*]'.
+    Stays a tuple — hashing a short tuple beats regex-substituting and
+    hashing the rendered path string."""
+    return tuple('[*]' if isinstance(s, int) else s for s in segs)
+
 
-def sig(path: str) -> str:
-    return _IDX.sub('[*]', path)
+# Types that can never seed a null-inference (containers, null itself)
+_INFER_SKIP = frozenset({"null", "object", "array"})
 
 
 def infer_nulls(rows: list) -> list:
     """Replace null type with inferred type from sibling paths."""
-    known: dict[str, str] = {}
-    for path, type_name, value in rows:
+    # sig() once per row — both passes below reuse the same values.
+    sigs = [sig(segs) for segs, _, _ in rows]
+
+    known: dict[tuple, str] = {}
+    for (segs, type_name, value), s in zip(rows, sigs):
         # Skip containers and already-null rows
         if value is None or value == "(empty)":
             continue
-        if type_name in ("null", "object", "array"):
+        if type_name in _INFER_SKIP:
             continue
-        s = sig(path)
-        if s not in known:
-            known[s] = type_name
+        known.setdefault(s, type_name)
 
     result = []
-    for path, type_name, value in rows:
+    for (segs, type_name, value), s in zip(rows, sigs):
         # Null primitive: value is stored as Python None, type_name == "null"
         if type_name == "null" and value is None:
-            inferred = known.get(sig(path))
-            result.append((path, inferred or "unknown", "(null)"))
+            inferred = known.get(s)
+            result.append((segs, inferred or "unknown", "(null)"))
         else:
-            result.append((path, type_name, value))
+            result.append((segs, type_name, value))
     return result
 
 
 # ── Schema deduplication ───────────────────────────────────────────────────────
+_SCHEMA_MARKERS = frozenset({None, "(empty)", "(null)"})
+
+
 def schema_rows(rows: list) -> list:
     """
     Collapse array indices [N] → [*] and deduplicate by structural path.
@@ -386,104 +482,114 @@ def schema_rows(rows: list) -> list:
     """
     seen: set = set()
     result = []
-    for path, type_name, value in rows:
-        struct_path = sig(path)          # [N] → [*]
+    for segs, type_name, value in rows:
+        struct_path = sig(segs)          # [N] → [*]
         key = (struct_path, type_name)
         if key in seen:
             continue
         seen.add(key)
         # Hide actual primitive values; keep special markers
-        if value not in (None, "(empty)", "(null)"):
+        if value not in _SCHEMA_MARKERS:
             value = None                 # suppress data, show type only
         result.append((struct_path, type_name, value))
     return result
 
 
-def filter_rows(rows: list, prefix: str) -> list:
-    """Keep rows whose path equals prefix or starts with prefix. / prefix["""
+def _filter_segments(prefix: str) -> Optional[tuple]:
+    """Parse a -F filter path into a segment tuple for prefix matching.
+    Like parse_path, but also accepts '[*]' (schema rows).
+    Returns None when the filter cannot be parsed (matches nothing)."""
+    s = prefix.strip()
+    if s == "root":
+        return ()
+    if s.startswith("root."):
+        s = s[5:]
+    elif s.startswith("root["):
+        s = s[4:]
+
+    segs: list = []
+    i = 0
+    while i < len(s):
+        if s[i] == '[':
+            j = s.find(']', i)
+            if j == -1:
+                return None
+            tok = s[i+1:j]
+            if tok == '*':
+                segs.append('[*]')
+            elif tok.isdigit():
+                segs.append(int(tok))
+            else:
+                return None
+            i = j + 1
+            if i < len(s) and s[i] == '.':
+                i += 1
+        else:
+            j = i
+            while j < len(s) and s[j] not in ('.', '['):
+                j += 1
+            if j == i:
+                return None
+            segs.append(s[i:j])
+            i = j
+            if i < len(s) and s[i] == '.':
+                i += 1
+    return tuple(segs)
+
+
+def filter_rows(rows: list, filter_segs: tuple) -> list:
+    """Keep rows whose segments equal filter_segs or extend it."""
+    n = len(filter_segs)
     out = []
     for row in rows:
-        p = row[0]
-        if p == prefix or p.startswith(prefix + '.') or p.startswith(prefix + '['):
+        if row[0][:n] == filter_segs:
             out.append(row)
     return out
 
 
-_ELEM_IDX = re.compile(r'\[(\d+)\]')
-
-def elem_offset_rows(rows: list, filter_path: str, elem_skip: int) -> list:
+def elem_slice_rows(rows: list, filter_segs: tuple,
+                    elem_skip: int = 0,
+                    elem_limit: Optional[int] = None) -> tuple:
     """
-    Skip first elem_skip array elements within filtered rows.
+    Apply offset + limit over array elements within filtered rows,
+    in a single pass.
 
-    Element boundaries are identified by direct-child paths of filter_path:
-      filter_path[N]  or  filter_path[N].anything
+    Element boundaries are identified by direct-child segments of
+    filter_segs: an int segment right after the filter prefix.
 
-    Header rows (path == filter_path exactly) are always kept.
+    Header rows (segments == filter_segs exactly) are always kept.
     Returns (result_rows, total_elements).
-    """
-    prefix_bracket = filter_path + '['
-    # Regex: filter_path[N] optionally followed by . or end
-    elem_re = re.compile(r'^' + re.escape(filter_path) + r'\[(\d+)\]')
 
-    header_rows: list = []
-    groups: dict = {}        # element_index (int) → [rows]
-    order: list = []         # insertion-ordered element indices
-
-    for row in rows:
-        path = row[0]
-        m = elem_re.match(path)
-        if m:
-            idx = int(m.group(1))
-            if idx not in groups:
-                groups[idx] = []
-                order.append(idx)
-            groups[idx].append(row)
-        else:
-            header_rows.append(row)
-
-    total_elems = len(order)
-    kept = order[elem_skip:]
-    result = list(header_rows)
-    for idx in kept:
-        result.extend(groups[idx])
-    return result, total_elems
-
-
-def elem_limit_rows(rows: list, filter_path: str, elem_count: int) -> tuple:
-    """
-    Keep only the first elem_count array elements within filtered rows.
-    Header rows (path == filter_path) are always kept.
-    Returns (result_rows, total_elements).
+    Relies on flatten() emitting rows in DFS order: all rows of one
+    element are contiguous, so a running counter replaces the
+    per-element grouping dict.
     """
-    elem_re = re.compile(r'^' + re.escape(filter_path) + r'\[(\d+)\]')
+    n = len(filter_segs)
+    elem_stop = None if elem_limit is None else elem_skip + elem_limit
 
-    header_rows: list = []
-    groups: dict = {}
-    order: list = []
+    result: list = []
+    total_elems = 0
+    prev_idx = None
 
     for row in rows:
-        path = row[0]
-        m = elem_re.match(path)
-        if m:
-            idx = int(m.group(1))
-            if idx not in groups:
-                groups[idx] = []
-                order.append(idx)
-            groups[idx].append(row)
+        segs = row[0]
+        if len(segs) > n and isinstance(segs[n], int) and segs[:n] == filter_segs:
+            idx = segs[n]
+            if idx != prev_idx:
+                prev_idx = idx
+                total_elems += 1
+            if total_elems > elem_skip and (elem_stop is None
+                                            or total_elems <= elem_stop):
+                result.append(row)
         else:
-            header_rows.append(row)
+            result.append(row)
 
-    total_elems = len(order)
-    kept = order[:elem_count]
-    result = list(header_rows)
-    for idx in kept:
-        result.extend(groups[idx])
     return result, total_elems
 
 
 def print_row(path: str, type_name: str, value):
     p = f"{C_PATH}{path}{C_RESET}"
-    t = f"{C_TYPE}{type_name}{C_RESET}"
+    t = _TYPE_COLORED.get(type_name) or f"{C_TYPE}{type_name}{C_RESET}"
     if value is None:
         print(f"{p} {t}")
     elif value == "(empty)":
@@ -512,31 +618,28 @@ def cmd_view(data: Any, schema: bool = False,
              offset: int = 0,
              elem_offset: int = 0,
              elem_limit: Optional[int] = None,
-             max_depth: Optional[int] = None):
-    rows = infer_nulls(flatten(data, max_depth=max_depth))
+             max_depth: Optional[int] = None,
+             base_segs: tuple = ()):
+    # base_segs: path of `data` within the document, for subtree-only
+    # streaming reads (see read_json_subtree)
+    rows = infer_nulls(flatten(data, segs=base_segs, max_depth=max_depth))
 
     if schema:
         rows = schema_rows(rows)
 
+    filter_segs: Optional[tuple] = None
     if filter_path is not None:
-        rows = filter_rows(rows, filter_path)
+        filter_segs = _filter_segments(filter_path)
+        rows = filter_rows(rows, filter_segs) if filter_segs is not None else []
 
     # Element-level operations (-E / -L): must be applied before row ops
     elem_footer = ""
     total_elems: Optional[int] = None
 
-    if (elem_offset > 0 or elem_limit is not None) and filter_path is not None:
-        # Apply offset first
-        if elem_offset > 0:
-            rows, total_elems = elem_offset_rows(rows, filter_path, elem_offset)
-        # Then apply limit
-        if elem_limit is not None:
-            rows, te = elem_limit_rows(rows, filter_path, elem_limit)
-            if total_elems is None:
-                total_elems = te
-        elif total_elems is None:
-            # compute total for footer without slicing
-            _, total_elems = elem_offset_rows(rows, filter_path, 0)
+    if (elem_offset > 0 or elem_limit is not None) and filter_segs is not None:
+        # Offset + limit + total count in one traversal
+        rows, total_elems = elem_slice_rows(rows, filter_segs,
+                                            elem_offset, elem_limit)
 
         shown_elems = elem_limit if elem_limit is not None else (total_elems - elem_offset)
         elem_footer = (f"  (elements {elem_offset}–{elem_offset + shown_elems - 1}"
@@ -554,26 +657,27 @@ def cmd_view(data: Any, schema: bool = False,
     truncated_by_tokens = False
     shown = 0
     next_path: Optional[str] = None
-    for path, type_name, value in rows:
+    out: list = []   # buffered lines; one write() instead of one per row
+    for segs, type_name, value in rows:
+        path = _render_path(segs)
         line = format_row(path, type_name, value)
         if would_exceed_token_budget(line + "\n"):
             truncated_by_tokens = True
             next_path = path
             break
-        print(line)
+        out.append(line)
         consume_token_budget(line + "\n")
         shown += 1
     if truncated_by_tokens:
         cap = get_max_tokens()
-        remain = len(rows) - shown
         msg1 = (f"── truncated: next row would exceed token cap "
                 f"(shown {shown}/{len(rows)}, cap={cap}) ──")
-        print(f"{C_DIM}{msg1}{C_RESET}")
+        out.append(f"{C_DIM}{msg1}{C_RESET}")
         hint = (f"  Hint: drill into one path with "
                 f"{C_BOLD}-F {next_path}{C_RESET}{C_DIM} "
                 f"instead of raising --max-tokens. "
                 f"Use {C_BOLD}--max-tokens 0{C_RESET}{C_DIM} only as a last resort.{C_RESET}")
-        print(f"{C_DIM}{hint}")
+        out.append(f"{C_DIM}{hint}")
 
     # Footer
     pagination = offset > 0 or limit is not None or elem_offset > 0 or elem_limit is not None
@@ -581,7 +685,11 @@ def cmd_view(data: Any, schema: bool = False,
         shown_start = offset + 1
         shown_end   = offset + shown
         line = f"── showing rows {shown_start}–{shown_end} of {total}{elem_footer} ──"
-        print(f"{C_DIM}{line}{C_RESET}")
+        out.append(f"{C_DIM}{line}{C_RESET}")
+
+    if out:
+        out.append("")   # trailing newline
+        sys.stdout.write("\n".join(out))
 
 
 # ── Find ───────────────────────────────────────────────────────────────────────
@@ -601,6 +709,8 @@ def cmd_find(data: Any, pattern: str,
     rows = infer_nulls(flatten(data))
 
     if glob_mode:
+        import fnmatch
+
         def matches(text: str) -> bool:
             t, p = (text.lower(), pattern.lower()) if case_insensitive else (text, pattern)
             return fnmatch.fnmatch(t, p)
@@ -618,7 +728,8 @@ def cmd_find(data: Any, pattern: str,
     found = 0
     truncated_by_tokens = False
     next_path: Optional[str] = None
-    for path, type_name, val_marker in rows:
+    for segs, type_name, val_marker in rows:
+        path = _render_path(segs)
         val_str = "" if val_marker is None or val_marker in ("(empty)",) else str(val_marker)
         hit_key = matches(path)
         if key_only:
@@ -652,6 +763,12 @@ def cmd_find(data: Any, pattern: str,
 
 
 # ── Path parser ────────────────────────────────────────────────────────────────
+# One scan in C: key | [N] | '.' separator. Anything the pattern skips
+# is a malformed bracket index. Only '[' opens an index, so a bare ']'
+# is an ordinary key character.
+_PATH_TOK = re.compile(r'([^.\[]+)|\[(\d+)\]|\.')
+
+
 def parse_path(path_str: str) -> list:
     """
     'users[0].name' → ['users', 0, 'name']
@@ -669,34 +786,31 @@ def parse_path(path_str: str) -> list:
     elif s.startswith("root["):
         s = s[4:]   # keep the leading '['
 
+    def _bad_index(pos: int):
+        j = s.find(']', pos)
+        bad = s[pos:j + 1] if j != -1 else s[pos:]
+        raise ValueError(f"Non-integer index in path: {bad!r}")
+
     segments: list = []
-    # Split on '.' but not inside brackets
-    # Strategy: tokenize character by character
-    # Tokens: identifier, [N]
-    i = 0
-    while i < len(s):
-        if s[i] == '[':
-            # array index
-            j = s.index(']', i)
-            idx_str = s[i+1:j]
-            if not idx_str.isdigit():
-                raise ValueError(f"Non-integer index in path: {s[i:j+1]!r}")
-            segments.append(int(idx_str))
-            i = j + 1
-            if i < len(s) and s[i] == '.':
-                i += 1   # skip dot after ']'
-        else:
-            # key name
-            j = i
-            while j < len(s) and s[j] not in ('.', '['):
-                j += 1
-            key = s[i:j]
-            if not key:
-                raise ValueError(f"Empty key in path: {path_str!r}")
+    pos = 0
+    after_dot = True    # leading '.' means an empty key
+    for m in _PATH_TOK.finditer(s):
+        if m.start() != pos:
+            _bad_index(pos)
+        pos = m.end()
+        key, idx = m.group(1), m.group(2)
+        if key is not None:
             segments.append(key)
-            i = j
-            if i < len(s) and s[i] == '.':
-                i += 1   # skip dot
+            after_dot = False
+        elif idx is not None:
+            segments.append(int(idx))
+            after_dot = False
+        else:   # '.' separator
+            if after_dot:
+                raise ValueError(f"Empty key in path: {path_str!r}")
+            after_dot = True
+    if pos != len(s):
+        _bad_index(pos)
     return segments
 
 
@@ -713,14 +827,16 @@ def navigate(data: Any, segments: list) -> tuple:
     for seg in segments:
         parent = node
         key = seg
+        # json.loads only ever yields exact dict/list, so identity checks
+        # beat isinstance's subclass walk on deep paths.
         if isinstance(seg, str):
-            if not isinstance(node, dict):
+            if type(node) is not dict:
                 raise TypeError(f"Expected object to look up key {seg!r}, got {type(node).__name__}")
             if seg not in node:
                 raise KeyError(f"Key not found: {seg!r}")
             node = node[seg]
         else:  # int
-            if not isinstance(node, list):
+            if type(node) is not list:
                 raise TypeError(f"Expected array for index {seg}, got {type(node).__name__}")
             if not (-len(node) <= seg < len(node)):
                 raise IndexError(f"Index {seg} out of range (len={len(node)})")
@@ -739,6 +855,11 @@ def parse_value(val_str: str) -> Any:
         filepath = val_str[1:]
         with open(filepath, "r", encoding="utf-8") as f:
             return json.load(f)
+    # Bare words (the common CLI case) can never parse as JSON — check
+    # the first character instead of paying for a raised JSONDecodeError.
+    s = val_str.lstrip()
+    if not s or s[0] not in '{[tfn"-0123456789':
+        return val_str
     try:
         return json.loads(val_str)
     except json.JSONDecodeError:
@@ -746,13 +867,84 @@ def parse_value(val_str: str) -> Any:
 
 
 # ── Preview helpers ────────────────────────────────────────────────────────────
-def _find_first(lines: list, search: str) -> Optional[tuple]:
-    """Find search in lines. Returns (line_idx, col_start, col_end) or None."""
-    for i, line in enumerate(lines):
-        col = line.find(search)
-        if col != -1:
-            return (i, col, col + len(search))
-    return None
+def _scope_crumbs(parent_segs: list) -> list:
+    """One breadcrumb label per ancestor skipped by scoped previews."""
+    return [f"[{s}]:" if isinstance(s, int) else f'"{s}":' for s in parent_segs]
+
+
+def _serialize_with_anchor(node: Any, target: tuple) -> tuple:
+    """
+    indent-2 serialize node (same layout as json.dumps) while tracking
+    where the value at segment path `target` lands.
+
+    Returns (pretty, line_idx, col_start, col_end). For primitives and
+    empty containers the columns bracket the value token; for non-empty
+    containers they bracket the opening brace/bracket. Unlike searching
+    the rendered text for the value, this cannot pick the wrong line
+    when the same value occurs elsewhere in the document.
+    """
+    lines: list = []
+    anchor: list = [0, 0, 0]
+
+    def emit(val: Any, prefix: str, indent: int, path: tuple):
+        pad = ' ' * indent
+        if isinstance(val, (dict, list)) and val:
+            open_ch, close_ch = ('{', '}') if isinstance(val, dict) else ('[', ']')
+            if path == target:
+                anchor[:] = [len(lines), indent + len(prefix), indent + len(prefix) + 1]
+            lines.append(pad + prefix + open_ch)
+            if isinstance(val, dict):
+                items = [(json.dumps(k, ensure_ascii=False) + ': ', v)
+                         for k, v in val.items()]
+                child_paths = [path + (k,) for k in val]
+            else:
+                items = [('', v) for v in val]
+                child_paths = [path + (i,) for i in range(len(val))]
+            last = len(items) - 1
+            for i, (child_prefix, v) in enumerate(items):
+                emit(v, child_prefix, indent + 2, child_paths[i])
+                if i != last:
+                    lines[-1] += ','
+            lines.append(pad + close_ch)
+        else:
+            token = ('{}' if isinstance(val, dict)
+                     else '[]' if isinstance(val, list)
+                     else json.dumps(val, ensure_ascii=False))
+            if path == target:
+                anchor[:] = [len(lines), indent + len(prefix),
+                             indent + len(prefix) + len(token)]
+            lines.append(pad + prefix + token)
+
+    emit(node, '', 0, ())
+    return '\n'.join(lines), anchor[0], anchor[1], anchor[2]
+
+
+def _pretty_with_anchor(data: Any, segments: list, redact: bool = False) -> tuple:
+    """
+    Scoped pretty text plus the exact anchor of the target value.
+
+    Serializes only the target's parent container (ancestors collapse to
+    breadcrumbs, see _print_crumbs) and records the target's line/column
+    during serialization — no re-searching of the rendered text.
+
+    Returns (pretty, line_idx, col_start, col_end, crumbs).
+    """
+    parent_segs = segments[:-1] if segments else []
+    crumbs = _scope_crumbs(parent_segs)
+    node = data
+    if parent_segs:
+        node = navigate(data, parent_segs)[2]
+    if redact:
+        node = _redact_for_display(node)
+    rel = tuple(segments[len(parent_segs):])
+    pretty, li, cs, ce = _serialize_with_anchor(node, rel)
+    return pretty, li, cs, ce, crumbs
+
+
+def _print_crumbs(crumbs: list):
+    """Dim breadcrumb lines for the ancestors omitted by scoped previews."""
+    for depth, crumb in enumerate(crumbs):
+        print(f"{C_DIM}{'  ' * depth}{crumb} …{C_RESET}")
 
 
 def _show_with_underline(pretty: str, line_idx: int,
@@ -764,15 +956,15 @@ def _show_with_underline(pretty: str, line_idx: int,
     """
     lines = pretty.split('\n')
     context = 3   # lines before/after to show in full
+    prefix = "  "
 
-    for i, line in enumerate(lines):
-        dist = abs(i - line_idx)
-        prefix = "  "
-        if dist > context:
-            # Print nothing - skip distant lines
-            if dist == context + 1:
-                print(f"{C_DIM}  ...{C_RESET}")
-            continue
+    # Only walk the visible window, not every line of the document
+    start = max(0, line_idx - context)
+    end   = min(len(lines), line_idx + context + 1)
+    if start > 0:
+        print(f"{C_DIM}  ...{C_RESET}")
+    for i in range(start, end):
+        line = lines[i]
         if i == line_idx:
             # Split line into before / target / after and colorize target
             before = line[:ul_start]
@@ -785,52 +977,11 @@ def _show_with_underline(pretty: str, line_idx: int,
             print(f"{spaces}{color}{tildes} {label}{C_RESET}")
         else:
             print(f"{prefix}{line}")
+    if end < len(lines):
+        print(f"{C_DIM}  ...{C_RESET}")
 
 
-def _find_closing_line(lines: list, open_li: int) -> int:
-    """
-    Given the line of an opening bracket ({ or [), find the line of its
-    matching closing bracket. Simple depth counter, good enough for
-    well-formed JSON.
-    """
-    open_char  = None
-    close_char = None
-    for c in lines[open_li]:
-        if c == '{':
-            open_char, close_char = '{', '}'
-            break
-        if c == '[':
-            open_char, close_char = '[', ']'
-            break
-    if open_char is None:
-        return open_li   # no bracket found, fallback
-
-    depth = 0
-    in_str = False
-    escaped = False
-    for li in range(open_li, len(lines)):
-        for c in lines[li]:
-            if escaped:
-                escaped = False
-                continue
-            if c == '\\' and in_str:
-                escaped = True
-                continue
-            if c == '"':
-                in_str = not in_str
-                continue
-            if in_str:
-                continue
-            if c == open_char:
-                depth += 1
-            elif c == close_char:
-                depth -= 1
-                if depth == 0:
-                    return li
-    return open_li   # fallback
-
-
-def _show_insert_marker(pretty: str, open_line_idx: int,
+def _show_insert_marker(pretty: str, open_line_idx: int, elem_val: Any,
                         indent_str: str, new_json: str, mode: str):
     """
     Show insertion marker.
@@ -844,14 +995,21 @@ def _show_insert_marker(pretty: str, open_line_idx: int,
     if mode == "before":
         anchor = open_line_idx        # insert before opening line
     else:
-        anchor = _find_closing_line(lines, open_line_idx)  # insert after closing line
+        # The element is already parsed, so its closing line is just the
+        # opening line plus the line count of its own indent-2 dump —
+        # no character-by-character bracket matching over the text.
+        if isinstance(elem_val, (dict, list)) and elem_val:
+            span = json.dumps(elem_val, indent=2, ensure_ascii=False).count('\n')
+        else:
+            span = 0
+        anchor = open_line_idx + span  # insert after closing line
 
-    for i, line in enumerate(lines):
-        dist = abs(i - anchor)
-        if dist > context:
-            if dist == context + 1:
-                print(f"{C_DIM}  ...{C_RESET}")
-            continue
+    start = max(0, anchor - context)
+    end   = min(len(lines), anchor + context + 1)
+    if start > 0:
+        print(f"{C_DIM}  ...{C_RESET}")
+    for i in range(start, end):
+        line = lines[i]
         if i == anchor and mode == "before":
             print(f"  {C_ADD}{insert_label}  ← INSERT HERE{C_RESET}")
             print(f"  {line}")
@@ -860,6 +1018,8 @@ def _show_insert_marker(pretty: str, open_line_idx: int,
             print(f"  {C_ADD}{insert_label}  ← INSERT HERE{C_RESET}")
         else:
             print(f"  {line}")
+    if end < len(lines):
+        print(f"{C_DIM}  ...{C_RESET}")
 
 
 # ── Diff preview helper ────────────────────────────────────────────────────────
@@ -882,6 +1042,23 @@ def _redact_for_display(data: Any, path: str = "root", root_level: bool = True)
     return data
 
 
+# Redact+dump results repeat when several previews touch the same
+# not-yet-mutated subtree in one process. Key on object identity and keep
+# the node alive next to its text so a recycled id() can never alias a
+# different object; any apply_* clears the cache since mutation stales it.
+_display_cache: dict = {}
+
+
+def _display_lines(node: Any) -> list:
+    hit = _display_cache.get(id(node))
+    if hit is not None and hit[0] is node:
+        return hit[1]
+    lines = json.dumps(_redact_for_display(node),
+                       indent=2, ensure_ascii=False).split('\n')
+    _display_cache[id(node)] = (node, lines)
+    return lines
+
+
 def _show_result_diff(orig_data: Any, result_data: Any, context: int = 3):
     """
     Show a git-style line diff between orig and result JSON.
@@ -889,10 +1066,10 @@ def _show_result_diff(orig_data: Any, result_data: Any, context: int = 3):
       red   (- line)  = removed
       green (+ line)  = added
     """
-    orig_disp   = _redact_for_display(orig_data)
-    result_disp = _redact_for_display(result_data)
-    orig_lines   = json.dumps(orig_disp,   indent=2, ensure_ascii=False).split('\n')
-    result_lines = json.dumps(result_disp, indent=2, ensure_ascii=False).split('\n')
+    import difflib
+
+    orig_lines   = _display_lines(orig_data)
+    result_lines = _display_lines(result_data)
 
     matcher = difflib.SequenceMatcher(None, orig_lines, result_lines, autojunk=False)
     groups  = list(matcher.get_grouped_opcodes(context))
@@ -929,11 +1106,20 @@ def preview_set(data: Any, segments: list, new_val: Any, path_str: str):
     old_json = json.dumps(old_for_label, ensure_ascii=False)
     new_json = json.dumps(new_for_label, ensure_ascii=False)
 
-    result = _copy.deepcopy(data)
-    result = apply_set(result, segments, new_val)
+    from copy import deepcopy
+    result = apply_set(deepcopy(data), segments, new_val)
 
     print()
-    _show_result_diff(data, result)
+    # Diff only the container holding the target; skipped ancestors
+    # collapse to breadcrumb lines. Whole-document dumps dominate preview
+    # cost on large inputs.
+    parent_segs = segments[:-1] if segments else []
+    if parent_segs:
+        _print_crumbs(_scope_crumbs(parent_segs))
+        _show_result_diff(navigate(data, parent_segs)[2],
+                          navigate(result, parent_segs)[2])
+    else:
+        _show_result_diff(data, result)
 
     old_short = shorten_value(old_json)
     new_short = shorten_value(new_json)
@@ -949,22 +1135,18 @@ def preview_del(data: Any, segments: list, path_str: str):
     sensitive = _is_sensitive_path(path_str)
     display_old = mask_secret(old_val) if sensitive and isinstance(old_val, str) else old_val
     old_json = json.dumps(display_old, ensure_ascii=False)
-    pretty   = json.dumps(_redact_for_display(data), indent=2, ensure_ascii=False)
-    lines    = pretty.split('\n')
 
     print()
     if not isinstance(old_val, (dict, list)):
-        # Leaf: find and underline
+        # Leaf: underline at the exact position recorded while serializing
+        pretty, li, cs, ce, crumbs = _pretty_with_anchor(data, segments,
+                                                         redact=True)
         if isinstance(key, str):
-            search = f'"{key}": {old_json}'
-        else:
-            search = old_json
-        found = _find_first(lines, search)
-        if found:
-            li, cs, ce = found
-            _show_with_underline(pretty, li, cs, ce, "← DELETE", C_DEL)
-        else:
-            print(f"  (could not locate value in JSON text)\n")
+            # Underline the key together with the value; measure the key
+            # as serialized so escapes (e.g. embedded quotes) line up.
+            cs -= len(json.dumps(key, ensure_ascii=False)) + 2
+        _print_crumbs(crumbs)
+        _show_with_underline(pretty, li, cs, ce, "← DELETE", C_DEL)
     else:
         # Container: show compact summary
         short = shorten_value(old_json)
@@ -978,50 +1160,6 @@ def preview_del(data: Any, segments: list, path_str: str):
     print("Run with -f to apply.\n")
 
 
-def _find_element_line(lines: list, val: Any) -> Optional[int]:
-    """
-    Find the line index of a JSON element's opening character.
-    For primitives: search directly. For dicts/lists: use a specific
-    key-value or child value to locate the element, then backtrack to its
-    opening bracket.
-    """
-    if not isinstance(val, (dict, list)):
-        found = _find_first(lines, json.dumps(val, ensure_ascii=False))
-        return found[0] if found else None
-
-    # For dict: search for first key-value pair (more specific than just '{')
-    if isinstance(val, dict) and val:
-        first_key = next(iter(val))
-        first_v   = val[first_key]
-        if not isinstance(first_v, (dict, list)):
-            # Search for "key": primitive_value
-            search = f'"{first_key}": {json.dumps(first_v, ensure_ascii=False)}'
-            found = _find_first(lines, search)
-            if found:
-                li = found[0]
-                # Walk backwards to find the opening '{' of this element
-                for back in range(li, max(li - 5, -1), -1):
-                    stripped = lines[back].strip()
-                    if stripped == '{' or stripped == '{,':
-                        return back
-                return li  # fallback: return the key line itself
-
-    # For list: search for first child element
-    if isinstance(val, list) and val:
-        child = val[0]
-        if not isinstance(child, (dict, list)):
-            found = _find_first(lines, json.dumps(child, ensure_ascii=False))
-            if found:
-                li = found[0]
-                for back in range(li, max(li - 5, -1), -1):
-                    stripped = lines[back].strip()
-                    if stripped == '[' or stripped == '[,':
-                        return back
-                return li
-
-    return None
-
-
 def _show_inline_label(lines: list, anchor_li: int, color: str, label: str):
     """
     Show a context window (±3 lines) around anchor_li.
@@ -1029,61 +1167,18 @@ def _show_inline_label(lines: list, anchor_li: int, color: str, label: str):
     No extra line is inserted — suitable for container opening brackets.
     """
     context = 3
-    for i, line in enumerate(lines):
-        dist = abs(i - anchor_li)
-        if dist > context:
-            if dist == context + 1:
-                print(f"{C_DIM}  ...{C_RESET}")
-            continue
+    start = max(0, anchor_li - context)
+    end   = min(len(lines), anchor_li + context + 1)
+    if start > 0:
+        print(f"{C_DIM}  ...{C_RESET}")
+    for i in range(start, end):
+        line = lines[i]
         if i == anchor_li:
             print(f"  {color}{line}{C_RESET}  {C_DIM}◀{C_RESET}  {color}{label}{C_RESET}")
         else:
             print(f"  {line}")
-
-
-def _show_node_context(pretty: str, key: Any, val: Any,
-                       label: str, color: str) -> bool:
-    """
-    Locate val (held under key) in pretty-printed JSON and show it with a label.
-    - Primitives: underline with tilde row (existing style).
-    - Containers: inline label appended to the opening bracket line.
-    key: str (dict key) | int (array index) | None (root).
-    Returns True if the location was found.
-    """
-    lines = pretty.split('\n')
-
-    if isinstance(key, str):
-        if isinstance(val, (dict, list)):
-            open_ch = '{' if isinstance(val, dict) else '['
-            search  = f'"{key}": {open_ch}'
-            found   = _find_first(lines, search)
-            if found:
-                li = found[0]
-                _show_inline_label(lines, li, color, label)
-                return True
-        else:
-            search = f'"{key}": {json.dumps(val, ensure_ascii=False)}'
-            found  = _find_first(lines, search)
-            if found:
-                li, cs, ce = found
-                val_start = cs + len(f'"{key}": ')
-                _show_with_underline(pretty, li, val_start, ce, label, color)
-                return True
-
-    elif isinstance(key, int):
-        if isinstance(val, (dict, list)):
-            ref_li = _find_element_line(lines, val)
-            if ref_li is not None:
-                _show_inline_label(lines, ref_li, color, label)
-                return True
-        else:
-            found = _find_first(lines, json.dumps(val, ensure_ascii=False))
-            if found:
-                li, cs, ce = found
-                _show_with_underline(pretty, li, cs, ce, label, color)
-                return True
-
-    return False
+    if end < len(lines):
+        print(f"{C_DIM}  ...{C_RESET}")
 
 
 def preview_insert(data: Any, segments: list,
@@ -1096,25 +1191,17 @@ def preview_insert(data: Any, segments: list,
         )
 
     new_json = json.dumps(new_val, ensure_ascii=False)
-    pretty   = json.dumps(data, indent=2, ensure_ascii=False)
-    lines    = pretty.split('\n')
-
-    # For simple primitives, search directly; for containers, use heuristic
-    if not isinstance(cur_val, (dict, list)):
-        found = _find_first(lines, json.dumps(cur_val, ensure_ascii=False))
-        ref_li = found[0] if found else None
-    else:
-        ref_li = _find_element_line(lines, cur_val)
+    # Anchor lands on the element's value token (or opening bracket for
+    # containers) — exactly the line the marker hangs off.
+    pretty, ref_li, _, _, crumbs = _pretty_with_anchor(data, segments)
+    lines = pretty.split('\n')
 
     print()
-    if ref_li is not None:
-        ref_line   = lines[ref_li]
-        indent_len = len(ref_line) - len(ref_line.lstrip())
-        indent_str = " " * indent_len
-        _show_insert_marker(pretty, ref_li, indent_str, new_json, mode)
-    else:
-        ins_idx = key if mode == "before" else key + 1
-        print(f"  Will insert {C_ADD}{new_json}{C_RESET} at index {ins_idx}\n")
+    ref_line   = lines[ref_li]
+    indent_len = len(ref_line) - len(ref_line.lstrip())
+    indent_str = " " * indent_len
+    _print_crumbs(crumbs)
+    _show_insert_marker(pretty, ref_li, cur_val, indent_str, new_json, mode)
 
     print(f"\n{C_BOLD}[PREVIEW]{C_RESET} "
           f"{mode} {C_PATH}{path_str}{C_RESET}: "
@@ -1126,28 +1213,11 @@ def preview_insert(data: Any, segments: list,
 def preview_set_null(data: Any, segments: list, path_str: str):
     parent, key, old_val = navigate(data, segments)
     old_json = json.dumps(old_val, ensure_ascii=False)
-    pretty   = json.dumps(data, indent=2, ensure_ascii=False)
-    lines    = pretty.split('\n')
+    pretty, li, cs, ce, crumbs = _pretty_with_anchor(data, segments)
 
     print()
-    if isinstance(key, str):
-        search    = f'"{key}": {old_json}'
-        found     = _find_first(lines, search)
-        if found:
-            li, cs, ce = found
-            val_start = cs + len(f'"{key}": ')
-            val_end   = cs + len(search)
-            _show_with_underline(pretty, li, val_start, val_end,
-                                 "→ null", C_MOD)
-        else:
-            print("  (could not locate value in JSON text)\n")
-    else:
-        found = _find_first(lines, old_json)
-        if found:
-            li, cs, ce = found
-            _show_with_underline(pretty, li, cs, ce, "→ null", C_MOD)
-        else:
-            print("  (could not locate value in JSON text)\n")
+    _print_crumbs(crumbs)
+    _show_with_underline(pretty, li, cs, ce, "→ null", C_MOD)
 
     print(f"\n{C_BOLD}[PREVIEW]{C_RESET} "
           f"set-null {C_PATH}{path_str}{C_RESET}: "
@@ -1157,6 +1227,7 @@ def preview_set_null(data: Any, segments: list, path_str: str):
 
 # ── Apply changes ──────────────────────────────────────────────────────────────
 def apply_set(data: Any, segments: list, new_val: Any) -> Any:
+    _display_cache.clear()
     if not segments:
         return new_val
     parent, key, _ = navigate(data, segments)
@@ -1165,6 +1236,7 @@ def apply_set(data: Any, segments: list, new_val: Any) -> Any:
 
 
 def apply_del(data: Any, segments: list) -> Any:
+    _display_cache.clear()
     if not segments:
         raise ValueError("Cannot delete root")
     parent, key, _ = navigate(data, segments)
@@ -1176,6 +1248,7 @@ def apply_del(data: Any, segments: list) -> Any:
 
 
 def apply_before(data: Any, segments: list, new_val: Any) -> Any:
+    _display_cache.clear()
     if not segments:
         raise ValueError("Cannot insert before root")
     parent, key, _ = navigate(data, segments)
@@ -1186,6 +1259,7 @@ def apply_before(data: Any, segments: list, new_val: Any) -> Any:
 
 
 def apply_after(data: Any, segments: list, new_val: Any) -> Any:
+    _display_cache.clear()
     if not segments:
         raise ValueError("Cannot insert after root")
     parent, key, _ = navigate(data, segments)
@@ -1196,6 +1270,7 @@ def apply_after(data: Any, segments: list, new_val: Any) -> Any:
 
 
 def apply_set_null(data: Any, segments: list) -> Any:
+    _display_cache.clear()
     if not segments:
         return None
     parent, key, _ = navigate(data, segments)
@@ -1204,9 +1279,22 @@ def apply_set_null(data: Any, segments: list) -> Any:
 
 
 # ── copy ───────────────────────────────────────────────────────────────────────
+def _overlaps(a: list, b: list) -> bool:
+    """True when one segment path is a prefix of the other (shared subtree)."""
+    n = min(len(a), len(b))
+    return a[:n] == b[:n]
+
+
 def apply_copy(data: Any, src_segs: list, dst_segs: list) -> Any:
+    _display_cache.clear()
     _, _, src_val = navigate(data, src_segs)
-    new_val = _copy.deepcopy(src_val)
+    # Deep-copying a large subtree is O(|subtree|); when src and dst
+    # don't overlap a shared reference serializes identically, and the
+    # CLI never mutates the tree again after an apply. Only an
+    # overlapping dst (copy into your own subtree) needs a real copy to
+    # avoid a self-referential structure.
+    from copy import deepcopy
+    new_val = deepcopy(src_val) if _overlaps(src_segs, dst_segs) else src_val
     # If destination is a new array index (>= current length), append instead
     if dst_segs:
         parent_segs, last_seg = dst_segs[:-1], dst_segs[-1]
@@ -1219,7 +1307,8 @@ def apply_copy(data: Any, src_segs: list, dst_segs: list) -> Any:
 
 def preview_copy(data: Any, src_segs: list, dst_segs: list,
                  src_str: str, dst_str: str):
-    result = _copy.deepcopy(data)
+    from copy import deepcopy
+    result = deepcopy(data)
     apply_copy(result, src_segs, dst_segs)
 
     print()
@@ -1234,6 +1323,11 @@ def preview_copy(data: Any, src_segs: list, dst_segs: list,
 def deep_merge(base: Any, patch: Any) -> Any:
     """Recursively merge patch into base. Dicts are merged; all other types replaced."""
     if isinstance(base, dict) and isinstance(patch, dict):
+        if not patch:
+            return base
+        if base.keys().isdisjoint(patch):
+            # No collisions: one merged allocation, no per-key recursion
+            return {**base, **patch}
         result = dict(base)
         for k, v in patch.items():
             result[k] = deep_merge(result[k], v) if k in result else v
@@ -1242,6 +1336,7 @@ def deep_merge(base: Any, patch: Any) -> Any:
 
 
 def apply_merge(data: Any, segs: list, patch: Any) -> Any:
+    _display_cache.clear()
     if not segs:
         return deep_merge(data, patch)
     parent, key, node = navigate(data, segs)
@@ -1253,8 +1348,8 @@ def preview_merge(data: Any, segs: list, patch: Any,
                   path_str: str, patch_src: str):
     node = navigate(data, segs)[2] if segs else data
 
-    result = _copy.deepcopy(data)
-    result = apply_merge(result, segs, patch)
+    from copy import deepcopy
+    result = apply_merge(deepcopy(data), segs, patch)
 
     print()
     _show_result_diff(data, result)
@@ -1316,6 +1411,33 @@ def _merge_schemas(schemas: list) -> dict:
     return {"oneOf": [{"type": t} for t in sorted(types)]}
 
 
+# Arrays of homogeneous records infer the same schema over and over;
+# memoize by shape for dicts whose values are all primitive (nested
+# containers are skipped — their shape key would cost as much as
+# re-inferring). Safe because inputs are never mutated during schema
+# inference; cached schemas are shared, read-only dicts.
+_FLAT_TYPES = {type(None): "null", bool: "boolean", int: "integer",
+               float: "number", str: "string"}
+_infer_memo: dict = {}
+
+
+def _flat_shape(data: dict) -> Optional[tuple]:
+    """Hashable shape key for a dict of primitives, else None.
+
+    An ordered tuple, not a frozenset: properties keep each record's
+    own key order, so two same-keyed dicts that differ only in order
+    memoize separately and output stays deterministic per shape."""
+    parts = []
+    for k, v in data.items():
+        t = _FLAT_TYPES.get(type(v))
+        if t is None:
+            return None
+        # third field mirrors the `required` test: only None and ""
+        # make a primitive value optional
+        parts.append((k, t, v is not None and v != ""))
+    return tuple(parts)
+
+
 def _infer(data: Any) -> dict:
     """Recursively infer JSON Schema for a value."""
     if data is None:
@@ -1332,21 +1454,35 @@ def _infer(data: Any) -> dict:
     if isinstance(data, list):
         if not data:
             return {"type": "array", "items": {}}
-        samples = data[:_SCHEMA_SAMPLE]
-        item_schemas = [_infer(item) for item in samples]
+        # islice avoids copying up to _SCHEMA_SAMPLE references per array
+        item_schemas = [_infer(item) for item in islice(data, _SCHEMA_SAMPLE)]
         return {"type": "array", "items": _merge_schemas(item_schemas)}
 
     if isinstance(data, dict):
         if not data:
             return {"type": "object", "properties": {}}
-        properties = {k: _infer(v) for k, v in data.items()}
-        required = sorted(
-            k for k, v in data.items()
-            if v is not None and v != "" and v != [] and v != {}
-        )
+        shape = _flat_shape(data)
+        if shape is not None:
+            hit = _infer_memo.get(shape)
+            if hit is not None:
+                return hit
+        # One pass over items() builds properties and required together
+        properties: dict = {}
+        required: list = []
+        for k, v in data.items():
+            properties[k] = _infer(v)
+            # required unless None or an empty str/list/dict; type
+            # dispatch avoids __eq__ against fresh empty literals
+            t = type(v)
+            if not (v is None or (t is str and not v)
+                    or (t is list and not v) or (t is dict and not v)):
+                required.append(k)
         result = {"type": "object", "properties": properties}
         if required:
+            required.sort()
             result["required"] = required
+        if shape is not None:
+            _infer_memo[shape] = result
         return result
 
     return {}
@@ -1359,21 +1495,89 @@ def cmd_schema(data: Any, title: str = "Inferred Schema"):
         "title": title,
     }
     schema.update(_infer(data))
-    print(json.dumps(schema, ensure_ascii=False, separators=(",", ":")))
+    _print_compact(schema)
 
 
 # ── I/O ────────────────────────────────────────────────────────────────────────
-def read_json(file_arg: Optional[str]) -> tuple:
-    """Returns (data, filepath_or_None)."""
+# Below this size the mmap syscalls cost more than the copy they save.
+_MMAP_MIN_SIZE = 64 * 1024
+
+
+def read_json(file_arg: Optional[str], lossless: bool = False) -> tuple:
+    """Returns (data, filepath_or_None).
+
+    lossless: parse with stdlib json regardless of orjson — orjson turns
+    integers beyond 64 bits into floats, so commands that write the
+    document back must not parse through it.
+    """
+    if lossless:
+        if file_arg:
+            with open(file_arg, "r", encoding="utf-8") as f:
+                return json.loads(f.read()), file_arg
+        return json.loads(sys.stdin.read()), None
     if file_arg:
+        if _orjson is not None and os.path.getsize(file_arg) >= _MMAP_MIN_SIZE:
+            # Let orjson scan the OS page cache directly instead of
+            # copying the file into a heap buffer first.
+            with open(file_arg, "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if _LONG_DIGITS.search(mm) is not None:
+                        return json.loads(mm[:]), file_arg
+                    mv = memoryview(mm)
+                    try:
+                        return _orjson.loads(mv), file_arg
+                    finally:
+                        # must release before the mmap can close
+                        mv.release()
         with open(file_arg, "r", encoding="utf-8") as f:
             raw = f.read()
-        return json.loads(raw), file_arg
+        return _loads(raw), file_arg
+    if _orjson is not None:
+        # orjson parses bytes directly — skip the UTF-8 decode to str
+        return _loads(sys.stdin.buffer.read()), None
     raw = sys.stdin.read()
-    return json.loads(raw), None
+    return _loads(raw), None
+
+
+# Optional streaming parser for subtree-only reads (view -F).
+try:
+    import ijson as _ijson
+except ImportError:
+    _ijson = None
+
+# Returned when a subtree cannot be streamed; callers fall back to a
+# full parse, which also produces the proper errors for bad paths.
+_SUBTREE_MISS = object()
+
+
+def read_json_subtree(file_arg: str, filter_segs: tuple) -> Any:
+    """
+    Materialize only the subtree at filter_segs by streaming the file
+    through ijson — peak memory stays O(subtree) instead of O(file).
+
+    Only pure dict-key paths stream (they map straight onto an ijson
+    prefix). Paths with an array index fall back to the full parse:
+    materializing a lone element would hide its siblings from
+    infer_nulls, which needs them to type null values.
+    """
+    if _ijson is None or any(not isinstance(seg, str) or seg == "[*]"
+                             for seg in filter_segs):
+        return _SUBTREE_MISS
+    prefix = ".".join(filter_segs)
+    try:
+        with open(file_arg, "rb") as f:
+            for node in _ijson.items(f, prefix, use_float=True):
+                return node
+            return _SUBTREE_MISS
+    except Exception:
+        return _SUBTREE_MISS
 
 
 def write_json(data: Any, filepath: str):
+    # Always stdlib here: orjson formats floats differently (e.g.
+    # 0.0000738668800442932 vs 7.38668800442932e-05), which would churn
+    # diffs on every write-back. orjson stays on the transient stdout
+    # paths where the exact text never lands in a file.
     with open(filepath, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
         f.write("\n")
@@ -1385,31 +1589,85 @@ def emit_result(data: Any, filepath: Optional[str], force: bool):
         write_json(data, filepath)
         print(f"{C_ADD}Written to {filepath}{C_RESET}")
     else:
-        print(json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+        _print_compact(data)
 
 
 # ── Fuzzy command suggestion ───────────────────────────────────────────────────
 COMMANDS = ["view", "schema", "find", "set", "before", "after", "del", "set-null", "copy", "merge", "help"]
 
 
+def _peq_table(a: str) -> dict:
+    """Character → bitmask of its positions in a (Myers' Peq)."""
+    peq: dict = {}
+    for i, ch in enumerate(a):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+    return peq
+
+
+def _myers_core(peq: dict, m: int, b: str) -> int:
+    """Myers edit-distance inner loop against a prebuilt Peq table."""
+    mask = (1 << m) - 1
+    hibit = 1 << (m - 1)
+    pv = mask          # positive/negative vertical delta bit-vectors
+    mv = 0
+    score = m
+    for ch in b:
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = (mv | ~(xh | pv)) & mask
+        mh = pv & xh
+        if ph & hibit:
+            score += 1
+        elif mh & hibit:
+            score -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = (mh | ~(xv | ph)) & mask
+        mv = ph & xv
+    return score
+
+
 def _levenshtein(a: str, b: str) -> int:
-    """Edit distance between two strings."""
-    m, n = len(a), len(b)
-    dp = list(range(n + 1))
-    for i in range(1, m + 1):
-        prev = dp[0]
-        dp[0] = i
-        for j in range(1, n + 1):
-            temp = dp[j]
-            dp[j] = prev if a[i-1] == b[j-1] else 1 + min(prev, dp[j], dp[j-1])
-            prev = temp
-    return dp[n]
+    """
+    Edit distance via Myers' bit-parallel algorithm: the DP column packs
+    into one int (one bit per character of a), so each character of b
+    costs a handful of bitwise ops instead of an inner Python loop.
+    """
+    if not a:
+        return len(b)
+    return _myers_core(_peq_table(a), len(a), b)
+
+
+# Prefer the C implementation when available; the pure-Python Myers
+# above stays as the fallback.
+try:
+    from rapidfuzz.distance import Levenshtein as _rf_levenshtein
+    _levenshtein = _rf_levenshtein.distance
+except ImportError:
+    _rf_levenshtein = None
+
+# COMMANDS never changes, so build each command's Peq table once at
+# import instead of on every typo lookup.
+_CMD_PEQ = [(cmd, len(cmd), _peq_table(cmd)) for cmd in COMMANDS]
+_COMMAND_SET = frozenset(COMMANDS)
 
 
 def suggest_commands(typo: str) -> list:
     """Return commands within edit-distance 3 of typo, sorted by distance."""
-    scored = [(c, _levenshtein(typo.lower(), c)) for c in COMMANDS]
-    threshold = max(2, len(typo) // 2)   # scale threshold with length
+    lc = typo.lower()
+    t = len(lc)
+    threshold = max(2, t // 2)   # scale threshold with length
+    if lc in _COMMAND_SET:       # e.g. wrong case of a real command
+        return [lc]
+    # distance >= |len gap|, so commands outside the threshold can be
+    # rejected without running the DP at all
+    if _rf_levenshtein is None:
+        scored = [(c, _myers_core(peq, m, lc))
+                  for c, m, peq in _CMD_PEQ if abs(m - t) <= threshold]
+    else:
+        scored = [(c, _levenshtein(lc, c))
+                  for c in COMMANDS if abs(len(c) - t) <= threshold]
     close = [(c, d) for c, d in scored if d <= threshold]
     close.sort(key=lambda x: x[1])
     return [c for c, _ in close]
@@ -1427,18 +1685,19 @@ def unknown_command_error(cmd: str):
 
 
 # ── Arg helpers ────────────────────────────────────────────────────────────────
-def pop_flag(args: list, flag: str) -> bool:
-    if flag in args:
-        args.remove(flag)
-        return True
-    return False
+# view option → cmd_view kwarg; every value except -F's parses as int
+_VIEW_OPTS = {"-F": "filter_path", "-n": "limit", "-O": "offset",
+              "-E": "elem_offset", "-L": "elem_limit", "-d": "max_depth"}
+
+
+_NON_BSTYLE_CMDS = frozenset(("view", "set", "before", "after",
+                              "del", "set-null", "help"))
 
 
 def is_bstyle(args: list) -> bool:
     """True if: jstool <path> = <value> ..."""
     return (len(args) >= 2 and args[1] == "="
-            and args[0] not in ("view", "set", "before", "after",
-                                 "del", "set-null", "help"))
+            and args[0] not in _NON_BSTYLE_CMDS)
 
 
 # ── Usage ──────────────────────────────────────────────────────────────────────
@@ -1488,26 +1747,247 @@ def usage():
 
 
 # ── Main ───────────────────────────────────────────────────────────────────────
-def _pop_int_flag(args: list, *names: str) -> Optional[int]:
-    """Pop the first occurrence of any of `names` followed by an int value.
-    Returns parsed int or None. Removes both the flag and its value from args."""
-    for name in names:
-        if name in args:
-            i = args.index(name)
-            if i + 1 < len(args):
-                val_str = args[i + 1]
-                del args[i:i + 2]
-                try:
-                    return int(val_str)
-                except ValueError:
-                    print(f"{C_DEL}Invalid integer for {name}: {val_str}{C_RESET}",
-                          file=sys.stderr)
-                    sys.exit(1)
-            else:
-                del args[i]
-                print(f"{C_DEL}Missing value for {name}{C_RESET}", file=sys.stderr)
+_GLOBAL_BOOL_FLAGS = frozenset(("-R", "--reveal", "--no-reveal",
+                                "-f", "--no-force"))
+_GLOBAL_INT_FLAGS = frozenset(("--max-tokens", "--value-max"))
+
+
+def _extract_global_flags(args: list) -> tuple:
+    """
+    One pass over argv instead of an in-check plus list.remove (two
+    traversals) per global flag. Returns (flags_seen, int_values, rest)
+    where rest is args with all global flags removed.
+    """
+    seen: set = set()
+    ints: dict = {}
+    rest: list = []
+    i = 0
+    n = len(args)
+    while i < n:
+        a = args[i]
+        if a in _GLOBAL_BOOL_FLAGS:
+            seen.add(a); i += 1
+        elif a in _GLOBAL_INT_FLAGS:
+            if i + 1 >= n:
+                print(f"{C_DEL}Missing value for {a}{C_RESET}", file=sys.stderr)
+                sys.exit(1)
+            try:
+                ints[a] = int(args[i + 1])
+            except ValueError:
+                print(f"{C_DEL}Invalid integer for {a}: {args[i + 1]}{C_RESET}",
+                      file=sys.stderr)
                 sys.exit(1)
-    return None
+            i += 2
+        else:
+            rest.append(a); i += 1
+    return seen, ints, rest
+
+
+# ── Command handlers ───────────────────────────────────────────────────────────
+# Each takes (rest, force); main() dispatches through _CMDS below.
+def _handle_view(rest: list, force: bool):
+    # Options: [-s] [-F <path>] [-n <N>] [-O <N>] [-E <N>] [-L <N>] [-d <N>] [file]
+    # Single pass over rest: one dict lookup per token (flags folded
+    # in) instead of a comparison chain per token.
+    opts: dict = {"filter_path": None, "limit": None, "offset": 0,
+                  "elem_offset": 0, "elem_limit": None, "max_depth": None}
+    schema = False
+    i = 0
+    n = len(rest)
+    positional = []
+    while i < n:
+        a = rest[i]
+        if a == "-s":
+            schema = True; i += 1
+            continue
+        key = _VIEW_OPTS.get(a)
+        if key is not None and i + 1 < n:
+            val = rest[i + 1]
+            opts[key] = val if key == "filter_path" else int(val)
+            i += 2
+        else:
+            positional.append(a); i += 1
+
+    filter_path = opts["filter_path"]
+    max_depth   = opts["max_depth"]
+    file_arg = positional[0] if positional else None
+    # With -F, stream only the requested subtree when possible.
+    # -d is excluded: flatten counts depth from wherever it starts,
+    # so a subtree read would shift the depth origin.
+    base_segs: Optional[tuple] = None
+    if file_arg and filter_path is not None and max_depth is None:
+        fsegs = _filter_segments(filter_path)
+        if fsegs:
+            subtree = read_json_subtree(file_arg, fsegs)
+            if subtree is not _SUBTREE_MISS:
+                data, base_segs = subtree, fsegs
+    if base_segs is None:
+        data, _ = read_json(file_arg)
+        base_segs = ()
+    cmd_view(data, schema=schema, base_segs=base_segs, **opts)
+
+
+def _handle_schema(rest: list, force: bool):
+    title = "Inferred Schema"
+    i = 0
+    positional = []
+    while i < len(rest):
+        if rest[i] == "--title" and i + 1 < len(rest):
+            title = rest[i + 1]; i += 2
+        else:
+            positional.append(rest[i]); i += 1
+    file_arg = positional[0] if positional else None
+    data, _ = read_json(file_arg)
+    cmd_schema(data, title)
+
+
+def _handle_find(rest: list, force: bool):
+    if not rest:
+        print("Usage: jstool find <pattern> [file] [-k] [-v] [-i] [-g]")
+        sys.exit(1)
+    # One pass collects all four flags
+    flags = {"-k": False, "-v": False, "-i": False, "-g": False}
+    positional = []
+    for a in rest:
+        if a in flags:
+            flags[a] = True
+        else:
+            positional.append(a)
+    key_only, val_only = flags["-k"], flags["-v"]
+    case_ins, glob_mode = flags["-i"], flags["-g"]
+    if key_only and val_only:
+        print("Error: -k and -v are mutually exclusive")
+        sys.exit(1)
+    if not positional:
+        print("Usage: jstool find <pattern> [file] [-k] [-v] [-i] [-g]")
+        sys.exit(1)
+    pattern  = positional[0]
+    file_arg = positional[1] if len(positional) > 1 else None
+    data, _  = read_json(file_arg)
+    cmd_find(data, pattern,
+             key_only=key_only, val_only=val_only,
+             case_insensitive=case_ins, glob_mode=glob_mode)
+
+
+def _handle_set(rest: list, force: bool):
+    if len(rest) < 2:
+        print("Usage: jstool set <path> <value> [file] [-f]")
+        sys.exit(1)
+    path_str, value_str = rest[0], rest[1]
+    file_arg = rest[2] if len(rest) > 2 else None
+    data, filepath = read_json(file_arg, lossless=True)
+    segs    = parse_path(path_str)
+    new_val = parse_value(value_str)
+    if not force:
+        preview_set(data, segs, new_val, path_str)
+    else:
+        apply_set(data, segs, new_val)
+        emit_result(data, filepath, force)
+
+
+def _handle_insert(rest: list, force: bool, mode: str):
+    if len(rest) < 2:
+        print(f"Usage: jstool {mode} <path> <value> [file] [-f]")
+        sys.exit(1)
+    path_str, value_str = rest[0], rest[1]
+    file_arg = rest[2] if len(rest) > 2 else None
+    data, filepath = read_json(file_arg, lossless=True)
+    segs    = parse_path(path_str)
+    new_val = parse_value(value_str)
+    if not force:
+        preview_insert(data, segs, new_val, path_str, mode)
+    else:
+        if mode == "before":
+            apply_before(data, segs, new_val)
+        else:
+            apply_after(data, segs, new_val)
+        emit_result(data, filepath, force)
+
+
+def _handle_before(rest: list, force: bool):
+    _handle_insert(rest, force, "before")
+
+
+def _handle_after(rest: list, force: bool):
+    _handle_insert(rest, force, "after")
+
+
+def _handle_del(rest: list, force: bool):
+    if not rest:
+        print("Usage: jstool del <path> [file] [-f]")
+        sys.exit(1)
+    path_str = rest[0]
+    file_arg = rest[1] if len(rest) > 1 else None
+    data, filepath = read_json(file_arg, lossless=True)
+    segs = parse_path(path_str)
+    if not force:
+        preview_del(data, segs, path_str)
+    else:
+        apply_del(data, segs)
+        emit_result(data, filepath, force)
+
+
+def _handle_set_null(rest: list, force: bool):
+    if not rest:
+        print("Usage: jstool set-null <path> [file] [-f]")
+        sys.exit(1)
+    path_str = rest[0]
+    file_arg = rest[1] if len(rest) > 1 else None
+    data, filepath = read_json(file_arg, lossless=True)
+    segs = parse_path(path_str)
+    if not force:
+        preview_set_null(data, segs, path_str)
+    else:
+        apply_set_null(data, segs)
+        emit_result(data, filepath, force)
+
+
+def _handle_copy(rest: list, force: bool):
+    if len(rest) < 2:
+        print("Usage: jstool copy <src-path> <dst-path> [file] [-f]")
+        sys.exit(1)
+    src_str, dst_str = rest[0], rest[1]
+    file_arg = rest[2] if len(rest) > 2 else None
+    data, filepath = read_json(file_arg, lossless=True)
+    src_segs = parse_path(src_str)
+    dst_segs = parse_path(dst_str)
+    if not force:
+        preview_copy(data, src_segs, dst_segs, src_str, dst_str)
+    else:
+        apply_copy(data, src_segs, dst_segs)
+        emit_result(data, filepath, force)
+
+
+def _handle_merge(rest: list, force: bool):
+    if len(rest) < 2:
+        print("Usage: jstool merge <path> <patch.json> [file] [-f]")
+        sys.exit(1)
+    path_str, patch_src = rest[0], rest[1]
+    file_arg = rest[2] if len(rest) > 2 else None
+    data, filepath = read_json(file_arg, lossless=True)
+    segs = parse_path(path_str)
+    # stdlib parse: the patch ends up in the written document too
+    with open(patch_src, "rb") as pf:
+        patch = json.loads(pf.read())
+    if not force:
+        preview_merge(data, segs, patch, path_str, patch_src)
+    else:
+        data = apply_merge(data, segs, patch)
+        emit_result(data, filepath, force)
+
+
+_CMDS = {
+    "view": _handle_view,
+    "schema": _handle_schema,
+    "find": _handle_find,
+    "set": _handle_set,
+    "before": _handle_before,
+    "after": _handle_after,
+    "del": _handle_del,
+    "set-null": _handle_set_null,
+    "copy": _handle_copy,
+    "merge": _handle_merge,
+}
 
 
 def main():
@@ -1518,26 +1998,28 @@ def main():
         usage()
         sys.exit(0)
 
+    flags, ints, args = _extract_global_flags(args)
+
     # Reveal: CLI flag overrides config default
-    if pop_flag(args, "-R") or pop_flag(args, "--reveal"):
+    if "-R" in flags or "--reveal" in flags:
         REVEAL_SECRETS = True
-    elif pop_flag(args, "--no-reveal"):
+    elif "--no-reveal" in flags:
         REVEAL_SECRETS = False
     # else: REVEAL_SECRETS keeps the config-default value loaded at import
 
     # Output limits: CLI overrides become RUNTIME_* (see _eff_limit chain)
-    n_override = _pop_int_flag(args, "--max-tokens")
+    n_override = ints.get("--max-tokens")
     if n_override is not None:
         RUNTIME_MAX_TOKENS = n_override
-    v_override = _pop_int_flag(args, "--value-max")
+    v_override = ints.get("--value-max")
     if v_override is not None:
         RUNTIME_VALUE_MAX = v_override
 
     # Force apply: CLI -f overrides config default. --no-force disables it.
     force = bool(DEFAULT_FORCE_APPLY)
-    if pop_flag(args, "-f"):
+    if "-f" in flags:
         force = True
-    if pop_flag(args, "--no-force"):
+    if "--no-force" in flags:
         force = False
 
     # ── B-style: <path> = <value> [file] ──────────────────────────────────────
@@ -1545,7 +2027,7 @@ def main():
         path_str  = args[0]
         value_str = args[2] if len(args) > 2 else ""
         file_arg  = args[3] if len(args) > 3 else None
-        data, filepath = read_json(file_arg)
+        data, filepath = read_json(file_arg, lossless=True)
         segs = parse_path(path_str)
         new_val = parse_value(value_str)
         if not force:
@@ -1556,179 +2038,10 @@ def main():
         return
 
     cmd  = args[0]
-    rest = args[1:]
-
-    # ── view ──────────────────────────────────────────────────────────────────
-    if cmd == "view":
-        # Options: [-s] [-F <path>] [-n <N>] [-O <N>] [-E <N>] [-L <N>] [-d <N>] [file]
-        schema      = pop_flag(rest, "-s")
-        filter_path = None
-        limit       = None
-        offset      = 0
-        elem_offset = 0
-        elem_limit  = None
-        max_depth   = None
-
-        # Parse options (may appear in any order)
-        i = 0
-        positional = []
-        while i < len(rest):
-            a = rest[i]
-            if a == "-F" and i + 1 < len(rest):
-                filter_path = rest[i + 1]; i += 2
-            elif a == "-n" and i + 1 < len(rest):
-                limit = int(rest[i + 1]); i += 2
-            elif a == "-O" and i + 1 < len(rest):
-                offset = int(rest[i + 1]); i += 2
-            elif a == "-E" and i + 1 < len(rest):
-                elem_offset = int(rest[i + 1]); i += 2
-            elif a == "-L" and i + 1 < len(rest):
-                elem_limit = int(rest[i + 1]); i += 2
-            elif a == "-d" and i + 1 < len(rest):
-                max_depth = int(rest[i + 1]); i += 2
-            else:
-                positional.append(a); i += 1
-
-        file_arg = positional[0] if positional else None
-        data, _ = read_json(file_arg)
-        cmd_view(data, schema=schema, filter_path=filter_path,
-                 limit=limit, offset=offset,
-                 elem_offset=elem_offset, elem_limit=elem_limit,
-                 max_depth=max_depth)
-
-    # ── schema ────────────────────────────────────────────────────────────────
-    elif cmd == "schema":
-        title = "Inferred Schema"
-        i = 0
-        positional = []
-        while i < len(rest):
-            if rest[i] == "--title" and i + 1 < len(rest):
-                title = rest[i + 1]; i += 2
-            else:
-                positional.append(rest[i]); i += 1
-        file_arg = positional[0] if positional else None
-        data, _ = read_json(file_arg)
-        cmd_schema(data, title)
-
-    # ── find ──────────────────────────────────────────────────────────────────
-    elif cmd == "find":
-        if not rest:
-            print("Usage: jstool find <pattern> [file] [-k] [-v] [-i] [-g]")
-            sys.exit(1)
-        key_only  = pop_flag(rest, "-k")
-        val_only  = pop_flag(rest, "-v")
-        case_ins  = pop_flag(rest, "-i")
-        glob_mode = pop_flag(rest, "-g")
-        if key_only and val_only:
-            print("Error: -k and -v are mutually exclusive")
-            sys.exit(1)
-        pattern  = rest[0]
-        file_arg = rest[1] if len(rest) > 1 else None
-        data, _  = read_json(file_arg)
-        cmd_find(data, pattern,
-                 key_only=key_only, val_only=val_only,
-                 case_insensitive=case_ins, glob_mode=glob_mode)
-
-    # ── set ───────────────────────────────────────────────────────────────────
-    elif cmd == "set":
-        if len(rest) < 2:
-            print("Usage: jstool set <path> <value> [file] [-f]")
-            sys.exit(1)
-        path_str, value_str = rest[0], rest[1]
-        file_arg = rest[2] if len(rest) > 2 else None
-        data, filepath = read_json(file_arg)
-        segs    = parse_path(path_str)
-        new_val = parse_value(value_str)
-        if not force:
-            preview_set(data, segs, new_val, path_str)
-        else:
-            apply_set(data, segs, new_val)
-            emit_result(data, filepath, force)
-
-    # ── before / after ────────────────────────────────────────────────────────
-    elif cmd in ("before", "after"):
-        if len(rest) < 2:
-            print(f"Usage: jstool {cmd} <path> <value> [file] [-f]")
-            sys.exit(1)
-        path_str, value_str = rest[0], rest[1]
-        file_arg = rest[2] if len(rest) > 2 else None
-        data, filepath = read_json(file_arg)
-        segs    = parse_path(path_str)
-        new_val = parse_value(value_str)
-        if not force:
-            preview_insert(data, segs, new_val, path_str, cmd)
-        else:
-            if cmd == "before":
-                apply_before(data, segs, new_val)
-            else:
-                apply_after(data, segs, new_val)
-            emit_result(data, filepath, force)
-
-    # ── del ───────────────────────────────────────────────────────────────────
-    elif cmd == "del":
-        if not rest:
-            print("Usage: jstool del <path> [file] [-f]")
-            sys.exit(1)
-        path_str = rest[0]
-        file_arg = rest[1] if len(rest) > 1 else None
-        data, filepath = read_json(file_arg)
-        segs = parse_path(path_str)
-        if not force:
-            preview_del(data, segs, path_str)
-        else:
-            apply_del(data, segs)
-            emit_result(data, filepath, force)
-
-    # ── set-null ──────────────────────────────────────────────────────────────
-    elif cmd == "set-null":
-        if not rest:
-            print("Usage: jstool set-null <path> [file] [-f]")
-            sys.exit(1)
-        path_str = rest[0]
-        file_arg = rest[1] if len(rest) > 1 else None
-        data, filepath = read_json(file_arg)
-        segs = parse_path(path_str)
-        if not force:
-            preview_set_null(data, segs, path_str)
-        else:
-            apply_set_null(data, segs)
-            emit_result(data, filepath, force)
-
-    # ── copy ──────────────────────────────────────────────────────────────────
-    elif cmd == "copy":
-        if len(rest) < 2:
-            print("Usage: jstool copy <src-path> <dst-path> [file] [-f]")
-            sys.exit(1)
-        src_str, dst_str = rest[0], rest[1]
-        file_arg = rest[2] if len(rest) > 2 else None
-        data, filepath = read_json(file_arg)
-        src_segs = parse_path(src_str)
-        dst_segs = parse_path(dst_str)
-        if not force:
-            preview_copy(data, src_segs, dst_segs, src_str, dst_str)
-        else:
-            apply_copy(data, src_segs, dst_segs)
-            emit_result(data, filepath, force)
-
-    # ── merge ─────────────────────────────────────────────────────────────────
-    elif cmd == "merge":
-        if len(rest) < 2:
-            print("Usage: jstool merge <path> <patch.json> [file] [-f]")
-            sys.exit(1)
-        path_str, patch_src = rest[0], rest[1]
-        file_arg = rest[2] if len(rest) > 2 else None
-        data, filepath = read_json(file_arg)
-        segs = parse_path(path_str)
-        with open(patch_src, "r", encoding="utf-8") as pf:
-            patch = json.load(pf)
-        if not force:
-            preview_merge(data, segs, patch, path_str, patch_src)
-        else:
-            data = apply_merge(data, segs, patch)
-            emit_result(data, filepath, force)
-
-    else:
+    handler = _CMDS.get(cmd)
+    if handler is None:
         unknown_command_error(cmd)
+    handler(args[1:], force)
 
 
 if __name__ == "__main__":